@@ -1,7 +1,7 @@
+import argparse
 import random
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 import json
-import pygame
 
 class Player:
     def __init__(self, name: str):
@@ -12,6 +12,7 @@ class Player:
         self.played_card = None
         self.eliminated = False
         self.won_round = False
+        self.policy = None  # Callable (player, player_list, disaster, tiebreak) -> point card index for bots, None for humans
 
     def __repr__(self):
         return f"{self.name} (Score: {self.score}, Disasters: {len(self.disasters)})"
@@ -34,6 +35,57 @@ class DisasterCard:
     def __repr__(self):
         return self.title
 
+DISASTER_TYPES = ["Meteor", "Natural", "Predator", "Emotional"]
+
+class Rules(NamedTuple):
+    # Built once per game and passed to the engine, defaults are the printed rules
+    hand_size: int = 5
+    win_score: int = 50
+    disaster_limit: int = 3
+    min_players: int = 2
+    max_players: int = 4
+    disaster_deck_size: int = 20
+    chainsaw_stops_effects: bool = True
+
+DEFAULT_RULES = Rules()
+MAX_TABLE_SIZE = 8
+
+def deck_card_count() -> int:
+    # Point and instant cards the JSON files put in a full deck
+    count = 0
+    for file_name in ('player_cards.json', 'player_instants.json'):
+        with open(file_name, 'r') as file:
+            count += sum(card_description["amount"] for card_description in json.load(file))
+    return count
+
+def load_rules(path: str) -> Rules:
+    with open(path, 'r') as file:
+        values = json.load(file)
+
+    for field, value in values.items():
+        if field not in Rules._fields:
+            raise ValueError(f"Unknown rule: {field}")
+        # bool is a subclass of int, so it has to be ruled out explicitly for int fields
+        if Rules.__annotations__[field] is bool:
+            valid = isinstance(value, bool)
+        else:
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        if not valid:
+            raise ValueError(f"{field} must be {Rules.__annotations__[field].__name__}, got {value!r}")
+    rules = Rules(**values)
+
+    if not 2 <= rules.min_players <= rules.max_players <= MAX_TABLE_SIZE:
+        raise ValueError(f"Player count must be between 2 and {MAX_TABLE_SIZE}")
+    if rules.hand_size < 1 or rules.win_score < 1 or rules.disaster_limit < 1 or rules.disaster_deck_size < 1:
+        raise ValueError("Hand size, win score, disaster limit and disaster deck size must be positive")
+
+    # Every seat holds a full hand plus the card it has in play
+    cards_needed = rules.max_players * (rules.hand_size + 1)
+    if cards_needed > deck_card_count():
+        raise ValueError(f"{rules.max_players} players with {rules.hand_size} card hands need {cards_needed} cards, "
+                         f"the deck has {deck_card_count()}")
+    return rules
+
 class Deck:
     def __init__(self):
         self.draw_deck = []
@@ -68,7 +120,7 @@ class Deck:
             print("Shuffling disaster discard pile back into deck...")
         return self.draw_disaster.pop()
 
-def create_decks() -> Deck:
+def create_decks(rules: Rules = DEFAULT_RULES) -> Deck:
     deck = Deck()
 
     with open('player_cards.json', 'r') as file:
@@ -95,20 +147,19 @@ def create_decks() -> Deck:
     random.shuffle(deck.draw_deck)
     
     # Create disaster cards
-    disaster_types = ["Meteor", "Natural", "Predator", "Emotional"]
-    for _ in range(20):
-        deck.draw_disaster.append(DisasterCard(random.choice(disaster_types)))
+    for _ in range(rules.disaster_deck_size):
+        deck.draw_disaster.append(DisasterCard(random.choice(DISASTER_TYPES)))
     
     random.shuffle(deck.draw_disaster)
     
     return deck
 
-def refill_player_hands(player_list: List[Player], deck: Deck):
+def refill_player_hands(player_list: List[Player], deck: Deck, rules: Rules = DEFAULT_RULES):
     for player in player_list:
         if player.eliminated:
             continue
             
-        while len(player.cards) < 5:
+        while len(player.cards) < rules.hand_size:
             card = deck.draw_card()
             if card:
                 player.cards.append(card)
@@ -120,18 +171,18 @@ def refill_player_hands(player_list: List[Player], deck: Deck):
             print(f"{player.name} has only instant cards! Discarding and redrawing...")
             deck.discard_pile.extend(player.cards)
             player.cards = []
-            for _ in range(5):
+            for _ in range(rules.hand_size):
                 card = deck.draw_card()
                 if card:
                     player.cards.append(card)
 
-def select_number_of_players() -> int:
+def select_number_of_players(rules: Rules = DEFAULT_RULES) -> int:
     while True:
         try:
-            num = int(input("How many players? (2-4): "))
-            if 2 <= num <= 4:
+            num = int(input(f"How many players? ({rules.min_players}-{rules.max_players}): "))
+            if rules.min_players <= num <= rules.max_players:
                 return num
-            print("Please enter a number between 2 and 4.")
+            print(f"Please enter a number between {rules.min_players} and {rules.max_players}.")
         except ValueError:
             print("Please enter a valid number.")
 
@@ -160,7 +211,23 @@ def show_hand(player: Player):
         else:
             print(f"    {i+1}. {card.title}, ({card.points}): {card.effect}")
 
-def play_point_cards(player_list: List[Player]):
+def choose_point_card(player: Player, player_list: List[Player], prompt: str,
+                      disaster: Optional[DisasterCard] = None, tiebreak: bool = False) -> int:
+    # Bots answer through their policy, humans are asked until they pick a point card
+    if player.policy:
+        return player.policy(player, player_list, disaster, tiebreak)
+
+    while True:
+        try:
+            choice = int(input(prompt)) - 1
+            if 0 <= choice < len(player.cards) and player.cards[choice].type == "point":
+                return choice
+            else:
+                print("Please choose a valid point card.")
+        except ValueError:
+            print("Please enter a valid number.")
+
+def play_point_cards(player_list: List[Player], disaster: Optional[DisasterCard] = None):
     print("\n--- PLAYING POINT CARDS ---")
     for player in player_list:
         if player.eliminated:
@@ -173,17 +240,9 @@ def play_point_cards(player_list: List[Player]):
             print(f"{player.name} has no point cards to play!")
             continue
         
-        while True:
-            try:
-                choice = int(input(f"Choose a point card to play (1-{len(player.cards)}): ")) - 1
-                if 0 <= choice < len(player.cards) and player.cards[choice].type == "point":
-                    player.played_card = player.cards.pop(choice)
-                    print(f"{player.name} played {player.played_card}")
-                    break
-                else:
-                    print("Please choose a valid point card.")
-            except ValueError:
-                print("Please enter a valid number.")
+        choice = choose_point_card(player, player_list, f"Choose a point card to play (1-{len(player.cards)}): ", disaster)
+        player.played_card = player.cards.pop(choice)
+        print(f"{player.name} played {player.played_card}")
 
 def reveal_cards(player_list: List[Player]):
     print("\n--- REVEALED CARDS ---")
@@ -194,7 +253,8 @@ def reveal_cards(player_list: List[Player]):
             else:
                 print(f"{player.name}: {player.played_card.title}, ({player.played_card.points}): {player.played_card.effect}")
 
-def disaster_sudden_death_handling(player_list: List[Player]) -> Optional[Player]:
+def disaster_sudden_death_handling(player_list: List[Player], deck: Deck,
+                                   disaster: Optional[DisasterCard] = None) -> Optional[Player]:
     active_players = [p for p in player_list if not p.eliminated and p.played_card]
     if not active_players:
         return None
@@ -230,17 +290,12 @@ def disaster_sudden_death_handling(player_list: List[Player]) -> Optional[Player
         for loser in losers:
             show_hand(loser)
             
-            while True:
-                try:
-                    choice = int(input(f"{loser.name}, choose a point card to play (1-{len(loser.cards)}): ")) - 1
-                    if 0 <= choice < len(loser.cards) and loser.cards[choice].type == "point":
-                        loser.played_card = loser.cards.pop(choice)
-                        print(f"{loser.name} played {loser.played_card}")
-                        break
-                    else:
-                        print("Please choose a valid point card.")
-                except ValueError:
-                    print("Please enter a valid number.")
+            choice = choose_point_card(loser, player_list, f"{loser.name}, choose a point card to play (1-{len(loser.cards)}): ",
+                                       disaster, tiebreak=True)
+            # The tied card is replaced, it goes to the discard pile rather than out of the game
+            deck.discard_pile.append(loser.played_card)
+            loser.played_card = loser.cards.pop(choice)
+            print(f"{loser.name} played {loser.played_card}")
         
         # Find new lowest
         min_points = min(p.played_card.points for p in losers)
@@ -301,13 +356,13 @@ def move_up_disaster_card_players(player_list: List[Player]):
             player.score += len(player.disasters)
             print(f"{player.name} moves up {len(player.disasters)} for disaster cards!")
 
-def check_eliminations(player_list: List[Player]):
+def check_eliminations(player_list: List[Player], rules: Rules = DEFAULT_RULES):
     for player in player_list:
-        if len(player.disasters) >= 3 and not player.eliminated:
+        if len(player.disasters) >= rules.disaster_limit and not player.eliminated:
             player.eliminated = True
-            print(f"\n💀 {player.name} has been ELIMINATED! (3 disasters)")
+            print(f"\n💀 {player.name} has been ELIMINATED! ({rules.disaster_limit} disasters)")
 
-def check_winners(player_list: List[Player]) -> Optional[Player]:
+def check_winners(player_list: List[Player], rules: Rules = DEFAULT_RULES) -> Optional[Player]:
     active_players = [p for p in player_list if not p.eliminated]
     
     if len(active_players) == 1:
@@ -315,7 +370,7 @@ def check_winners(player_list: List[Player]) -> Optional[Player]:
         return active_players[0]
     
     for player in active_players:
-        if player.score >= 50:
+        if player.score >= rules.win_score:
             print(f"\n🎉 {player.name} WINS with {player.score} points!")
             player.won_round = True
             return player
@@ -356,18 +411,18 @@ def use_effect_question():
         except ValueError:
             print("Please enter a valid number.")
 
-def effect_handler(player_list: List[Player], deck: Deck):
+def effect_handler(player_list: List[Player], deck: Deck, rules: Rules = DEFAULT_RULES):
     # Sort players from least points to most
     # Don't include eliminated players        
     sorted_players = sorted(player_list, key=lambda x: x.score)
 
     for player in sorted_players:
-        if player.played_card.title == "Flaming Chainsaw":
+        if rules.chainsaw_stops_effects and player.played_card and player.played_card.title == "Flaming Chainsaw":
             print("Flaming Chainsaw Stops All Effects!!!")
             return
         
     for player in sorted_players:
-        if player.eliminated:
+        if player.eliminated or not player.played_card:
             continue
         if player.played_card.effect == "None":
             continue
@@ -541,14 +596,19 @@ def effect_handler(player_list: List[Player], deck: Deck):
         if player.played_card.title == "Mouth Trap":
             highest_card_score = 0
             lowest_card_score = 999
-            for player in player_list:
-                score = player.played_card.points
+            # Eliminated players have no played card
+            for other in player_list:
+                if not other.played_card:
+                    continue
+                score = other.played_card.points
                 if score > highest_card_score:
                     highest_card_score = score
                 if score < lowest_card_score:
                     lowest_card_score = score
 
             for i, selected_player in enumerate(player_list):
+                if not selected_player.played_card:
+                    continue
                 if selected_player.played_card.points == highest_card_score:
                     player_list[i].played_card.points = lowest_card_score
                 elif selected_player.played_card.points == lowest_card_score:
@@ -711,64 +771,112 @@ def instant_handler(instant_card: PlayerCard, player: Player, player_list: List[
             except ValueError:
                 print("Please enter a valid number.")
 
-def game_start():
-    print("🦖 Welcome to Happy Little Dinosaurs! 🦖\n")
-    
-    num_players = select_number_of_players()
-    player_list = enter_player_names(num_players)
-    deck = create_decks()
+def discard_played_cards(player_list: List[Player], deck: Deck):
+    for player in player_list:
+        if player.played_card:
+            deck.discard_pile.append(player.played_card)
+            player.played_card = None
+        # Eliminated players never play their hand again
+        if player.eliminated and player.cards:
+            deck.discard_pile.extend(player.cards)
+            player.cards = []
 
-    round_num = 1
-    
-    while True:
-        print(f"\n{'='*50}")
-        print(f"ROUND {round_num}")
-        print('='*50)
+def play_rounds(player_list: List[Player], deck: Deck, rules: Rules = DEFAULT_RULES, on_phase=None,
+                interactive: bool = True, max_rounds: Optional[int] = None) -> Optional[Player]:
+    # Round loop shared by the console game, self-play and the pygame view.
+    # on_phase(phase, round_num, disaster, loser) is called for "round" (before dealing), "disaster",
+    # "revealed", "resolved" and "end".
+    # Effects, instants and the loser's discard are only asked at the console, so they need interactive=True.
+    round_num = 0
+    while max_rounds is None or round_num < max_rounds:
+        # Out of disasters counts as a draw
+        if not deck.draw_disaster and not deck.discard_disaster_pile:
+            return None
+        round_num += 1
+        loser = None
+        disaster = None
+        if on_phase:
+            on_phase("round", round_num, disaster, loser)
+
+        refill_player_hands(player_list, deck, rules)
 
-        refill_player_hands(player_list, deck)
-        
         disaster = play_disaster(deck)
-        
-        play_point_cards(player_list)
+        if on_phase:
+            on_phase("disaster", round_num, disaster, loser)
 
-        reveal_cards(player_list)
+        play_point_cards(player_list, disaster)
 
-        effect_handler(player_list, deck)
-        
         reveal_cards(player_list)
+        if on_phase:
+            on_phase("revealed", round_num, disaster, loser)
+
+        if interactive:
+            effect_handler(player_list, deck, rules)
+
+            reveal_cards(player_list)
+
+            instants_handler(player_list, deck)
+
+        loser = disaster_sudden_death_handling(player_list, deck, disaster)
 
-        instants_handler(player_list, deck)
-        
-        loser = disaster_sudden_death_handling(player_list)
-        
         reward_disaster(loser, disaster, deck)
-        
+
         reward_points(player_list)
-        
+
         move_up_disaster_card_players(player_list)
-        
-        check_eliminations(player_list)
-        
-        winner = check_winners(player_list)
+
+        check_eliminations(player_list, rules)
+        if on_phase:
+            on_phase("resolved", round_num, disaster, loser)
+
+        winner = check_winners(player_list, rules)
         if winner:
-            print("\n" + "="*50)
-            print("GAME OVER!")
-            print("="*50)
-            print("\nFinal Standings:")
-            for player in sorted(player_list, key=lambda p: p.score, reverse=True):
-                status = "ELIMINATED" if player.eliminated else f"{player.score} points"
-                print(f"  {player.name}: {status}")
-            break
-        
-        loser_discard_option(loser, deck)
-        
+            return winner
+
+        if interactive:
+            loser_discard_option(loser, deck)
+
+        discard_played_cards(player_list, deck)
+        if on_phase:
+            on_phase("end", round_num, disaster, loser)
+    return None
+
+def console_phase(phase: str, round_num: int, disaster: Optional[DisasterCard], loser: Optional[Player],
+                  player_list: List[Player]):
+    if phase == "round":
+        print(f"\n{'='*50}")
+        print(f"ROUND {round_num}")
+        print('='*50)
+    elif phase == "end":
         print("\nCurrent Standings:")
         for player in player_list:
             if not player.eliminated:
                 print(f"  {player}")
-        
-        round_num += 1
+
         input("\nPress Enter to continue to next round...")
 
+def game_start(rules: Rules = DEFAULT_RULES):
+    print("🦖 Welcome to Happy Little Dinosaurs! 🦖\n")
+    
+    num_players = select_number_of_players(rules)
+    player_list = enter_player_names(num_players)
+    deck = create_decks(rules)
+
+    winner = play_rounds(player_list, deck, rules,
+                         lambda phase, round_num, disaster, loser: console_phase(phase, round_num, disaster, loser, player_list))
+
+    print("\n" + "="*50)
+    print("GAME OVER!")
+    print("="*50)
+    if not winner:
+        print("The disaster deck ran out, nobody wins.")
+    print("\nFinal Standings:")
+    for player in sorted(player_list, key=lambda p: p.score, reverse=True):
+        status = "ELIMINATED" if player.eliminated else f"{player.score} points"
+        print(f"  {player.name}: {status}")
+
 if __name__ == "__main__":
-    game_start()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Play Happy Little Dinosaurs at the console")
+    parser.add_argument("--rules", help="Rules-variant JSON file, e.g. rules_large_table.json")
+    args = parser.parse_args()
+    game_start(load_rules(args.rules) if args.rules else DEFAULT_RULES)
@@ -0,0 +1,116 @@
+import argparse
+import functools
+import json
+from typing import List, Optional
+
+import numpy as np
+
+from best_main import DISASTER_TYPES, Player, DisasterCard
+from self_play import (HAND, HAND_SIZE, MAX_PLAYERS, OWN_SCORE, OPPONENT_SCORES, OWN_DISASTERS,
+                       DISASTER_TYPE, TIEBREAK, DECISION_SLOT, DECISION_CARD, OUTCOME)
+
+# Abstract state dimensions
+POINT_CARD_BUCKETS = HAND_SIZE      # 1-5 point cards in hand
+HIGH_CARD_BUCKETS = 3               # Best point card 0-3, 4-7, 8+
+SCORE_GAP_BUCKETS = 9               # Own score minus best opponent, in steps of 5 from -20 to +20
+DISASTER_BUCKETS = 3                # Disasters held, 2 or more share a bucket
+STATE_SHAPE = (POINT_CARD_BUCKETS, HIGH_CARD_BUCKETS, SCORE_GAP_BUCKETS, DISASTER_BUCKETS, len(DISASTER_TYPES), 2)
+NUM_STATES = int(np.prod(STATE_SHAPE))
+
+# Actions are the rank of the point card to play, lowest first
+NUM_ACTIONS = HAND_SIZE
+UNSEEN = -1
+CHUNK_ROWS = 1 << 20  # Feature rows read at a time when compiling
+
+def point_card_points() -> np.ndarray:
+    # Point card ids come first in the self-play card ids, in JSON order
+    with open('player_cards.json', 'r') as file:
+        return np.array([card_description["points"] for card_description in json.load(file)], dtype=np.int16)
+
+def state_index(point_cards, high_card, score_gap, disasters, disaster_type, tiebreak):
+    # Works on single values as well as whole feature columns
+    return np.ravel_multi_index((np.clip(point_cards - 1, 0, POINT_CARD_BUCKETS - 1),
+                                 np.clip(high_card // 4, 0, HIGH_CARD_BUCKETS - 1),
+                                 np.clip((score_gap + 20) // 5, 0, SCORE_GAP_BUCKETS - 1),
+                                 np.clip(disasters, 0, DISASTER_BUCKETS - 1),
+                                 np.clip(disaster_type, 0, len(DISASTER_TYPES) - 1),
+                                 np.clip(tiebreak, 0, 1)), STATE_SHAPE)
+
+def _chunk_cells(features: np.ndarray, points: np.ndarray):
+    # Table cell (state, action) and outcome of every usable decision in one chunk of rows
+    features = features[features[:, DECISION_SLOT] < HAND_SIZE]
+
+    hand = features[:, HAND:HAND + HAND_SIZE]
+    is_point = (hand >= 0) & (hand < len(points))
+    hand_points = np.where(is_point, points[np.clip(hand, 0, len(points) - 1)], -1)
+    chosen_points = points[features[:, DECISION_CARD]]
+    rank = np.sum(is_point & (hand_points < chosen_points[:, None]), axis=1)
+
+    best_opponent = features[:, OPPONENT_SCORES:OPPONENT_SCORES + MAX_PLAYERS - 1].max(axis=1)
+    states = state_index(is_point.sum(axis=1), hand_points.max(axis=1),
+                         features[:, OWN_SCORE].astype(np.int64) - best_opponent, features[:, OWN_DISASTERS],
+                         features[:, DISASTER_TYPE], features[:, TIEBREAK])
+    return states * NUM_ACTIONS + rank, features[:, OUTCOME]
+
+def compile_table(features: np.ndarray, min_samples: int = 20, chunk_rows: int = CHUNK_ROWS) -> np.ndarray:
+    # Pick, for every abstract state, the point card rank with the best win rate in the self-play data.
+    # Counts are accumulated chunk by chunk so a memory-mapped file is never loaded whole.
+    points = point_card_points()
+    plays = np.zeros(NUM_STATES * NUM_ACTIONS, dtype=np.int64)
+    wins = np.zeros(NUM_STATES * NUM_ACTIONS, dtype=np.int64)
+
+    for start in range(0, len(features), chunk_rows):
+        cells, outcome = _chunk_cells(np.asarray(features[start:start + chunk_rows]), points)
+        plays += np.bincount(cells, minlength=len(plays))
+        wins += np.bincount(cells, weights=outcome, minlength=len(wins)).astype(np.int64)
+
+    plays = plays.reshape(NUM_STATES, NUM_ACTIONS)
+    wins = wins.reshape(NUM_STATES, NUM_ACTIONS)
+    win_rate = np.where(plays >= min_samples, wins / np.maximum(plays, 1), -1.0)
+    table = win_rate.argmax(axis=1).astype(np.int8)
+    table[(plays >= min_samples).sum(axis=1) == 0] = UNSEEN
+    return table
+
+class TablePolicy:
+    def __init__(self, table: np.ndarray, cache_size: int = 4096):
+        self.table = table
+        seen = table[table != UNSEEN]
+        self.default_rank = int(np.bincount(seen).argmax()) if len(seen) else 0
+        self.fallback = functools.lru_cache(maxsize=cache_size)(self.nearest_rank)
+
+    @classmethod
+    def load(cls, path: str) -> "TablePolicy":
+        return cls(np.load(path))
+
+    def nearest_rank(self, state: int) -> int:
+        # Unseen state: borrow the answer from the closest score gap that was seen
+        index = list(np.unravel_index(state, STATE_SHAPE))
+        gap = index[2]
+        for distance in range(1, SCORE_GAP_BUCKETS):
+            for neighbour in (gap - distance, gap + distance):
+                if 0 <= neighbour < SCORE_GAP_BUCKETS:
+                    index[2] = neighbour
+                    rank = self.table[np.ravel_multi_index(index, STATE_SHAPE)]
+                    if rank != UNSEEN:
+                        return int(rank)
+        return self.default_rank
+
+    def __call__(self, player: Player, player_list: List[Player], disaster: Optional[DisasterCard], tiebreak: bool) -> int:
+        point_cards = sorted((i for i, c in enumerate(player.cards) if c.type == "point"), key=lambda i: player.cards[i].points)
+        best_opponent = max((p.score for p in player_list if p is not player), default=player.score)
+        state = int(state_index(len(point_cards), player.cards[point_cards[-1]].points, player.score - best_opponent,
+                                len(player.disasters), DISASTER_TYPES.index(disaster.type) if disaster else 0,
+                                int(tiebreak)))
+
+        rank = self.table[state]
+        if rank == UNSEEN:
+            rank = self.fallback(state)
+        return point_cards[min(rank, len(point_cards) - 1)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile self-play features into a policy lookup table")
+    parser.add_argument("features")
+    parser.add_argument("table")
+    parser.add_argument("--min-samples", type=int, default=20)
+    args = parser.parse_args()
+    np.save(args.table, compile_table(np.load(args.features, mmap_mode="r"), args.min_samples))
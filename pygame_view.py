@@ -0,0 +1,241 @@
+import argparse
+import os
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from best_main import (DEFAULT_RULES, Rules, load_rules, Player, PlayerCard, DisasterCard, create_decks, play_rounds)
+from self_play import random_policy
+
+WIDTH, HEIGHT = 1000, 700
+HEADER_HEIGHT = 40
+INFO_WIDTH = 220
+MARGIN = 8
+FPS = 60
+PHASE_DELAY = 1200  # ms a phase stays on screen before a bot game moves on
+RULE_SET = "Point cards, disasters and scoring only; card effects and instants are not played"
+
+BACKGROUND = (34, 85, 51)
+HEADER = (20, 50, 30)
+TEXT = (240, 240, 230)
+CARD_FACE = (250, 245, 225)
+CARD_INSTANT = (210, 225, 250)
+CARD_BACK = (120, 60, 40)
+CARD_EDGE = (30, 30, 30)
+HIGHLIGHT = (255, 210, 60)
+ELIMINATED = (120, 120, 120)
+
+class CardSurfaces:
+    # Rendered cards are cached by their look, a redraw is only a blit
+    def __init__(self, width: int, height: int):
+        self.size = (width, height)
+        self.title_font = pygame.font.Font(None, max(12, height // 6))
+        self.points_font = pygame.font.Font(None, max(20, height // 2))
+        self.cache: Dict[Tuple, pygame.Surface] = {}
+
+    def get(self, card: Optional[PlayerCard], face_up: bool, highlight: bool = False) -> pygame.Surface:
+        key = (card.title, card.points, card.type, face_up, highlight) if card else (None, None, None, face_up, highlight)
+        surface = self.cache.get(key)
+        if surface is None:
+            surface = self.render(card, face_up, highlight)
+            self.cache[key] = surface
+        return surface
+
+    def render(self, card: Optional[PlayerCard], face_up: bool, highlight: bool) -> pygame.Surface:
+        surface = pygame.Surface(self.size)
+        rect = surface.get_rect()
+        if not card or not face_up:
+            surface.fill(CARD_BACK)
+        else:
+            surface.fill(CARD_INSTANT if card.type == "instant" else CARD_FACE)
+            title = self.title_font.render(card.title, True, CARD_EDGE)
+            surface.blit(title, (4, 4))
+            label = "Instant" if card.type == "instant" else str(card.points)
+            points = self.points_font.render(label, True, CARD_EDGE)
+            surface.blit(points, points.get_rect(center=rect.center))
+        pygame.draw.rect(surface, HIGHLIGHT if highlight else CARD_EDGE, rect, 3 if highlight else 1)
+        return surface
+
+class GameView:
+    def __init__(self, player_list: List[Player], show_all_hands: bool = False, delay: int = PHASE_DELAY,
+                 hand_size: int = DEFAULT_RULES.hand_size):
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption(f"Happy Little Dinosaurs - {RULE_SET}")
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.Font(None, 24)
+        self.player_list = player_list
+        self.show_all_hands = show_all_hands
+        self.delay = delay
+        self.round_num = 0
+        self.disaster: Optional[DisasterCard] = None
+        self.message = ""
+        self.revealed = False
+        self.active: Optional[Player] = None
+
+        # Each seat gets a horizontal band: info, played card, then the hand.
+        # Cards are as tall as the band allows, but the played card and a full hand must fit across.
+        self.band_height = (HEIGHT - HEADER_HEIGHT) // len(player_list)
+        max_width = (WIDTH - INFO_WIDTH) // (hand_size + 1) - MARGIN
+        self.card_width = min(int((self.band_height - 2 * MARGIN) * 0.72), max_width)
+        self.card_height = min(self.band_height - 2 * MARGIN, int(self.card_width / 0.72))
+        self.cards = CardSurfaces(self.card_width, self.card_height)
+
+        self.drawn: Dict[Tuple, Tuple] = {}  # Region -> state it was last drawn with
+        self.hand_rects: Dict[int, List[pygame.Rect]] = {}
+
+        self.screen.fill(BACKGROUND)
+        pygame.display.flip()
+
+    def band(self, seat: int) -> pygame.Rect:
+        return pygame.Rect(0, HEADER_HEIGHT + seat * self.band_height, WIDTH, self.band_height)
+
+    def card_rect(self, seat: int, slot: int) -> pygame.Rect:
+        band = self.band(seat)
+        x = INFO_WIDTH + slot * (self.card_width + MARGIN)
+        return pygame.Rect(x, band.y + MARGIN, self.card_width, self.card_height)
+
+    def region(self, key: Tuple, state: Tuple, rect: pygame.Rect, dirty: List[pygame.Rect]) -> bool:
+        # Only regions whose state changed since the last frame are redrawn
+        if self.drawn.get(key) == state:
+            return False
+        self.drawn[key] = state
+        self.screen.fill(HEADER if key[0] == "header" else BACKGROUND, rect)
+        dirty.append(rect)
+        return True
+
+    def draw(self):
+        dirty: List[pygame.Rect] = []
+
+        header = pygame.Rect(0, 0, WIDTH, HEADER_HEIGHT)
+        disaster = self.disaster.title if self.disaster else ""
+        if self.region(("header",), (self.round_num, disaster, self.message), header, dirty):
+            text = f"Round {self.round_num}   {disaster}   {self.message}"
+            self.screen.blit(self.font.render(text, True, TEXT), (MARGIN, MARGIN))
+
+        for seat, player in enumerate(self.player_list):
+            band = self.band(seat)
+
+            info = pygame.Rect(0, band.y, INFO_WIDTH, band.height)
+            state = (player.name, player.score, tuple(d.type for d in player.disasters), player.eliminated, player is self.active)
+            if self.region(("info", seat), state, info, dirty):
+                colour = ELIMINATED if player.eliminated else (HIGHLIGHT if player is self.active else TEXT)
+                self.screen.blit(self.font.render(player.name, True, colour), (MARGIN, band.y + MARGIN))
+                self.screen.blit(self.font.render(f"Score: {player.score}", True, colour), (MARGIN, band.y + MARGIN + 22))
+                disasters = ", ".join(d.type for d in player.disasters) or "No disasters"
+                self.screen.blit(self.font.render(disasters, True, colour), (MARGIN, band.y + MARGIN + 44))
+
+            # Played card sits in slot 0, hand follows
+            played = player.played_card
+            played_rect = self.card_rect(seat, 0)
+            if self.region(("played", seat), (played and (played.title, played.points), self.revealed), played_rect, dirty):
+                if played:
+                    self.screen.blit(self.cards.get(played, self.revealed), played_rect)
+
+            face_up = self.show_all_hands or player is self.active
+            rects = [self.card_rect(seat, slot + 1) for slot in range(len(player.cards))]
+            hand_x = INFO_WIDTH + self.card_width + MARGIN
+            hand_area = pygame.Rect(hand_x, band.y, WIDTH - hand_x, band.height)
+            state = (tuple((c.title, c.points) for c in player.cards), face_up)
+            if self.region(("hand", seat), state, hand_area, dirty):
+                for card, rect in zip(player.cards, rects):
+                    self.screen.blit(self.cards.get(card, face_up, face_up and card.type == "point" and player is self.active), rect)
+            self.hand_rects[seat] = rects
+
+        if dirty:
+            pygame.display.update(dirty)
+
+    def redraw(self):
+        # The window lost its contents (uncovered, restored), so every region is stale
+        self.drawn.clear()
+        self.screen.fill(BACKGROUND)
+        self.draw()
+        pygame.display.flip()
+
+    def handle(self, event: pygame.event.Event):
+        if event.type == pygame.QUIT:
+            raise SystemExit
+        if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+            self.redraw()
+
+    def on_phase(self, phase: str, round_num: int, disaster: Optional[DisasterCard], loser: Optional[Player]):
+        # Subscribed to the engine's round loop
+        self.round_num = round_num
+        self.disaster = disaster
+        if phase == "disaster":
+            self.revealed = False
+            self.show("Playing point cards")
+        elif phase == "revealed":
+            self.revealed = True
+            self.show("Revealed")
+            self.wait(self.delay)
+        elif phase == "resolved":
+            self.show(f"{loser.name} takes the disaster" if loser else "Nobody takes the disaster")
+            self.wait(self.delay)
+        else:
+            self.show()
+
+    def show(self, message: str = None):
+        if message is not None:
+            self.message = message
+        self.draw()
+
+    def wait(self, milliseconds: int):
+        # Sleep in the event queue instead of spinning, so an idle window costs nothing
+        end = pygame.time.get_ticks() + milliseconds
+        while True:
+            remaining = end - pygame.time.get_ticks()
+            if remaining <= 0:
+                return
+            self.handle(pygame.event.wait(remaining))
+            self.clock.tick(FPS)
+
+    def choose_point_card(self, player: Player, player_list: List[Player], disaster: Optional[DisasterCard], tiebreak: bool) -> int:
+        # Policy for a human seat: wait for a click on one of their point cards
+        self.active = player
+        self.show("Sudden death! Choose a point card" if tiebreak else f"{player.name}, choose a point card")
+        seat = self.player_list.index(player)
+        try:
+            while True:
+                event = pygame.event.wait()
+                self.handle(event)
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    for i, rect in enumerate(self.hand_rects[seat]):
+                        if rect.collidepoint(event.pos) and player.cards[i].type == "point":
+                            return i
+                self.clock.tick(FPS)
+        finally:
+            self.active = None
+
+def play(num_players: int, human_seats: List[int], delay: int = PHASE_DELAY, rules: Rules = DEFAULT_RULES) -> Optional[Player]:
+    player_list = [Player(f"Player {i+1}" if i in human_seats else f"Bot {i+1}") for i in range(num_players)]
+    view = GameView(player_list, show_all_hands=not human_seats, delay=delay, hand_size=rules.hand_size)
+    for i, player in enumerate(player_list):
+        player.policy = view.choose_point_card if i in human_seats else random_policy
+    deck = create_decks(rules)
+
+    # Effects, instants and the loser's discard can only be answered at the console, which would
+    # freeze the window, so the view plays the reduced RULE_SET shown in its caption
+    winner = play_rounds(player_list, deck, rules, view.on_phase, interactive=False)
+
+    view.show(f"{winner.name} wins!" if winner else "Game over")
+    view.wait(delay)
+    return winner
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Happy Little Dinosaurs in a window")
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--humans", type=int, default=1, help="Number of human seats, seated first")
+    parser.add_argument("--rules", help="Rules-variant JSON file")
+    parser.add_argument("--headless", action="store_true", help="Bots only, using SDL's dummy video driver")
+    args = parser.parse_args()
+    rules = load_rules(args.rules) if args.rules else DEFAULT_RULES
+    if not rules.min_players <= args.players <= rules.max_players:
+        parser.error(f"--players must be between {rules.min_players} and {rules.max_players}")
+
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.init()
+    try:
+        play(args.players, [] if args.headless else list(range(args.humans)), 0 if args.headless else PHASE_DELAY, rules)
+    finally:
+        pygame.quit()
@@ -0,0 +1,229 @@
+import argparse
+import contextlib
+import multiprocessing
+import os
+import random
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from best_main import (DISASTER_TYPES, DEFAULT_RULES, MAX_TABLE_SIZE, Rules, load_rules, Player, DisasterCard,
+                       create_decks, play_rounds)
+from shared_deck import DeckFactory, build_catalogue, SharedDeckTemplate, attach_worker, worker_deck_factory
+
+MAX_PLAYERS = MAX_TABLE_SIZE
+DEFAULT_PLAYERS = 4
+HAND_SIZE = 5  # Hand slots per row, rules variants with larger hands are rejected
+MAX_ROUNDS = 200
+BUFFER_ROWS = 1024  # Decisions held in memory per game before it is written out, grows if a game needs more
+
+# Column layout of one decision row. Unused slots hold -1.
+SEAT = 0
+HAND = SEAT + 1                           # Card id of each hand slot
+OWN_SCORE = HAND + HAND_SIZE
+OPPONENT_SCORES = OWN_SCORE + 1           # Other seats in seat order
+OWN_DISASTERS = OPPONENT_SCORES + MAX_PLAYERS - 1
+OPPONENT_DISASTERS = OWN_DISASTERS + 1
+DISASTER_TYPE = OPPONENT_DISASTERS + MAX_PLAYERS - 1
+REVEALED = DISASTER_TYPE + 1              # Card points of every seat face up when deciding (sudden death only)
+ROUND_REVEALED = REVEALED + MAX_PLAYERS   # Cards of every seat revealed after the decision, the deciding seat's included
+TIEBREAK = ROUND_REVEALED + MAX_PLAYERS
+DECISION_SLOT = TIEBREAK + 1
+DECISION_CARD = DECISION_SLOT + 1
+OUTCOME = DECISION_CARD + 1               # 1 if the deciding seat won the game
+NUM_FEATURES = OUTCOME + 1
+
+def card_titles() -> List[str]:
+    # Card ids are the catalogue rows: point cards, then instants, in JSON order
+    catalogue, _ = build_catalogue()
+    return [title.decode() for title in catalogue["title"]]
+
+def random_point_card(player: Player) -> int:
+    return random.choice([i for i, c in enumerate(player.cards) if c.type == "point"])
+
+def random_policy(player: Player, player_list: List[Player], disaster: Optional[DisasterCard], tiebreak: bool) -> int:
+    return random_point_card(player)
+
+class SelfPlayRecorder:
+    # Seats the recorder sits in are played by the wrapped policy, and each of its decisions is written out
+    def __init__(self, path: str, capacity: int, policy=random_policy):
+        # Rows are written to a preallocated .npy file, readable with np.load(path, mmap_mode="r")
+        self.features = np.lib.format.open_memmap(path, mode="w+", dtype=np.int16, shape=(capacity, NUM_FEATURES))
+        self.card_ids = {title: i for i, title in enumerate(card_titles())}
+        self.count = 0
+        # A game's rows are built in memory and written out with one slice assignment when it ends
+        self.buffer = np.full((BUFFER_ROWS, NUM_FEATURES), -1, dtype=np.int16)
+        self.pending = 0
+        self.policy = policy
+        self.round_start = 0
+        self.player_list = []
+        # Cards face up when the current sudden-death wave began, and the seats that have chosen in it
+        self.tiebreak_cards = {}
+        self.tiebreak_seats = set()
+
+    def full(self) -> bool:
+        return self.count + self.pending >= len(self.features)
+
+    def start_game(self, player_list: List[Player]):
+        self.player_list = player_list
+        self.pending = 0
+
+    def on_phase(self, phase: str, round_num: int, disaster: Optional[DisasterCard], loser: Optional[Player]):
+        if phase == "disaster":
+            self.round_start = self.pending
+            self.tiebreak_seats = set()
+        elif phase == "revealed":
+            self.reveal()
+
+    def __call__(self, player: Player, player_list: List[Player], disaster: Optional[DisasterCard], tiebreak: bool) -> int:
+        if tiebreak:
+            self.snapshot_tiebreak(player)
+        choice = self.policy(player, player_list, disaster, tiebreak)
+        if not self.full():
+            self.record(player, choice, disaster, tiebreak)
+        return choice
+
+    def record(self, player: Player, choice: int, disaster: Optional[DisasterCard], tiebreak: bool):
+        if self.pending == len(self.buffer):
+            self.buffer = np.concatenate([self.buffer, np.full_like(self.buffer, -1)])
+
+        row = self.buffer[self.pending]
+        row[SEAT] = self.player_list.index(player)
+
+        for slot, card in enumerate(player.cards[:HAND_SIZE]):
+            row[HAND + slot] = self.card_ids[card.title]
+
+        opponents = [p for p in self.player_list if p is not player]
+        row[OWN_SCORE] = player.score
+        row[OWN_DISASTERS] = len(player.disasters)
+        for i, opponent in enumerate(opponents):
+            row[OPPONENT_SCORES + i] = opponent.score
+            row[OPPONENT_DISASTERS + i] = len(opponent.disasters)
+
+        # Sudden death is decided with the previous cards face up
+        if tiebreak:
+            for seat, points in self.tiebreak_cards.items():
+                row[REVEALED + seat] = points
+
+        row[DISASTER_TYPE] = DISASTER_TYPES.index(disaster.type) if disaster else -1
+        row[TIEBREAK] = tiebreak
+        row[DECISION_SLOT] = choice
+        row[DECISION_CARD] = self.card_ids[player.cards[choice].title]
+        self.pending += 1
+
+    def face_up_cards(self) -> dict:
+        return {seat: player.played_card.points for seat, player in enumerate(self.player_list)
+                if not player.eliminated and player.played_card}
+
+    def snapshot_tiebreak(self, player: Player):
+        # A seat choosing twice means a new wave has started. Tied players replace their
+        # played card one after another, so later choosers must not see those cards.
+        seat = self.player_list.index(player)
+        if not self.tiebreak_seats or seat in self.tiebreak_seats:
+            self.tiebreak_cards = self.face_up_cards()
+            self.tiebreak_seats = set()
+        self.tiebreak_seats.add(seat)
+
+    def reveal(self):
+        # The round's cards, known only after every decision made so far this round
+        rows = self.buffer[self.round_start:self.pending]
+        for seat, points in self.face_up_cards().items():
+            rows[:, ROUND_REVEALED + seat] = points
+
+    def end_game(self, winner: Optional[Player]):
+        rows = self.buffer[:self.pending]
+        winner_seat = self.player_list.index(winner) if winner else -1
+        rows[:, OUTCOME] = rows[:, SEAT] == winner_seat
+
+        self.features[self.count:self.count + self.pending] = rows
+        self.count += self.pending
+        rows[:] = -1
+        self.pending = 0
+
+def check_table(num_players: int, rules: Rules):
+    # A decision row has fixed seat and hand columns
+    if num_players > MAX_PLAYERS:
+        raise ValueError(f"Self-play features hold at most {MAX_PLAYERS} seats, got {num_players}")
+    if rules.hand_size > HAND_SIZE:
+        raise ValueError(f"Self-play features hold at most {HAND_SIZE} hand cards, got hand_size {rules.hand_size}")
+
+def play_game(recorder: SelfPlayRecorder, policies: List, deck_factory: Optional[DeckFactory] = None,
+              rules: Rules = DEFAULT_RULES) -> Optional[Player]:
+    # One policy per seat; seats driven by the recorder are the ones written out
+    check_table(len(policies), rules)
+    player_list = [Player(f"Bot {i+1}") for i in range(len(policies))]
+    for player, policy in zip(player_list, policies):
+        player.policy = policy
+    deck = deck_factory.new_deck(rules) if deck_factory else create_decks(rules)
+    recorder.start_game(player_list)
+
+    # Bots cannot answer the console-only effect and instant prompts
+    winner = play_rounds(player_list, deck, rules, recorder.on_phase, interactive=False, max_rounds=MAX_ROUNDS)
+    recorder.end_game(winner)
+    return winner
+
+def generate(path: str, num_decisions: int, num_players: int = DEFAULT_PLAYERS,
+             deck_factory: Optional[DeckFactory] = None, rules: Rules = DEFAULT_RULES, policy=random_policy) -> np.memmap:
+    check_table(num_players, rules)
+    recorder = SelfPlayRecorder(path, num_decisions, policy)
+    # Without a shared template, build the cards once here rather than reading the JSON every game
+    deck_factory = deck_factory or DeckFactory(*build_catalogue())
+
+    # The engine narrates every move, which would dominate the run time
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        while not recorder.full():
+            play_game(recorder, [recorder] * num_players, deck_factory, rules)
+
+    recorder.features.flush()
+    return recorder.features
+
+def _generate_shard(args):
+    path, num_decisions, num_players, rules = args
+    generate(path, num_decisions, num_players, worker_deck_factory(), rules)
+    return path
+
+def generate_parallel(path: str, num_decisions: int, num_players: int = DEFAULT_PLAYERS, processes: int = 2,
+                      rules: Union[Rules, Sequence[Rules]] = DEFAULT_RULES) -> List[str]:
+    # Each worker writes its own shard; the deck template is shared instead of rebuilt per worker.
+    # rules is one variant for every shard, or one variant per shard.
+    shard_rules = [rules] * processes if isinstance(rules, Rules) else list(rules)
+    if len(shard_rules) != processes:
+        raise ValueError(f"Expected one rules variant per shard ({processes}), got {len(shard_rules)}")
+    for variant in shard_rules:
+        check_table(num_players, variant)
+
+    stem, extension = os.path.splitext(path)
+    shards = [(f"{stem}_{i}{extension or '.npy'}", num_decisions // processes + (i < num_decisions % processes), num_players, variant)
+              for i, variant in enumerate(shard_rules)]
+
+    template = SharedDeckTemplate.create()
+    try:
+        with multiprocessing.Pool(processes, initializer=attach_worker, initargs=(template.name,)) as pool:
+            return pool.map(_generate_shard, shards)
+    finally:
+        template.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate self-play decision features")
+    parser.add_argument("path")
+    parser.add_argument("decisions", type=int)
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS)
+    parser.add_argument("--rules", action="append",
+                        help="Rules-variant JSON file; repeat once per process to give each shard its own variant")
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+    rules_list = [load_rules(path) for path in args.rules] if args.rules else [DEFAULT_RULES]
+    if len(rules_list) not in (1, args.processes):
+        parser.error(f"--rules must be given once or once per process ({args.processes})")
+    for rules in rules_list:
+        if not rules.min_players <= args.players <= rules.max_players:
+            parser.error(f"--players must be between {rules.min_players} and {rules.max_players}")
+        if rules.hand_size > HAND_SIZE:
+            parser.error(f"hand_size must be at most {HAND_SIZE} for self-play")
+    if len(rules_list) == 1:
+        rules_list *= args.processes
+
+    if args.processes > 1:
+        generate_parallel(args.path, args.decisions, args.players, args.processes, rules_list)
+    else:
+        generate(args.path, args.decisions, args.players, rules=rules_list[0])
@@ -0,0 +1,118 @@
+import json
+import random
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from best_main import DISASTER_TYPES, DEFAULT_RULES, Rules, PlayerCard, DisasterCard, Deck
+
+TEMPLATE_DTYPE = np.int16
+
+def catalogue_dtype(title_width: int, effect_width: int) -> np.dtype:
+    # One row per distinct card, row index is the card id used by self-play
+    return np.dtype([("title", f"S{title_width}"), ("effect", f"S{effect_width}"), ("points", np.int16), ("instant", np.bool_)])
+
+def build_catalogue():
+    # Point cards, then instants, in JSON order
+    rows = []
+    amounts = []
+    for file_name, instant in (('player_cards.json', False), ('player_instants.json', True)):
+        with open(file_name, 'r') as file:
+            for card_description in json.load(file):
+                rows.append((card_description["title"].encode(), card_description["effect"].encode(),
+                             card_description.get("points") or 0, instant))
+                amounts.append(card_description["amount"])
+
+    # Text fields are sized to the longest entry so nothing is truncated
+    title_width = max(len(row[0]) for row in rows)
+    effect_width = max(len(row[1]) for row in rows)
+    catalogue = np.array(rows, dtype=catalogue_dtype(title_width, effect_width))
+    template = np.repeat(np.arange(len(catalogue), dtype=TEMPLATE_DTYPE), amounts)
+    return catalogue, template
+
+class SharedDeckTemplate:
+    # Layout of the block: [catalogue size, template size, title width, effect width] header,
+    # catalogue rows, template card ids
+    HEADER_DTYPE = np.int64
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+
+        header = np.ndarray((4,), dtype=self.HEADER_DTYPE, buffer=shm.buf)
+        num_cards, deck_size, title_width, effect_width = (int(value) for value in header)
+        offset = header.nbytes
+        self.catalogue = np.ndarray((num_cards,), dtype=catalogue_dtype(title_width, effect_width),
+                                    buffer=shm.buf, offset=offset)
+        offset += self.catalogue.nbytes
+        self.template = np.ndarray((deck_size,), dtype=TEMPLATE_DTYPE, buffer=shm.buf, offset=offset)
+
+        if not owner:
+            self.catalogue.flags.writeable = False
+            self.template.flags.writeable = False
+
+    @classmethod
+    def create(cls) -> "SharedDeckTemplate":
+        catalogue, template = build_catalogue()
+        header = np.array([len(catalogue), len(template), catalogue.dtype["title"].itemsize,
+                           catalogue.dtype["effect"].itemsize], dtype=cls.HEADER_DTYPE)
+
+        shm = shared_memory.SharedMemory(create=True, size=header.nbytes + catalogue.nbytes + template.nbytes)
+        shm.buf[:header.nbytes] = header.tobytes()
+        shm.buf[header.nbytes:header.nbytes + catalogue.nbytes] = catalogue.tobytes()
+        shm.buf[header.nbytes + catalogue.nbytes:header.nbytes + catalogue.nbytes + template.nbytes] = template.tobytes()
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedDeckTemplate":
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        # Drop the numpy views first, the block cannot close while they are exported
+        self.catalogue = None
+        self.template = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+class DeckFactory:
+    # Builds every PlayerCard once per process; a new game only resets points and shuffles
+    def __init__(self, catalogue: np.ndarray, template: np.ndarray):
+        self.base_points = catalogue["points"][template].tolist()
+        self.cards = []
+        for card_id in template:
+            title, effect, points, instant = catalogue[card_id]
+            self.cards.append(PlayerCard(title=title.decode(),
+                                         card_type="instant" if instant else "point",
+                                         points=None if instant else int(points),
+                                         effect=effect.decode()))
+
+    def new_deck(self, rules: Rules = DEFAULT_RULES) -> Deck:
+        deck = Deck()
+
+        # Effects change points in place during a game
+        for card, points in zip(self.cards, self.base_points):
+            if card.type == "point":
+                card.points = points
+
+        deck.draw_deck = random.sample(self.cards, len(self.cards))
+        for _ in range(rules.disaster_deck_size):
+            deck.draw_disaster.append(DisasterCard(random.choice(DISASTER_TYPES)))
+        return deck
+
+_worker_template: Optional[SharedDeckTemplate] = None
+_worker_factory: Optional[DeckFactory] = None
+
+def attach_worker(name: str):
+    # Pool initializer: attach to the shared template and keep a factory for this process
+    global _worker_template, _worker_factory
+    _worker_template = SharedDeckTemplate.attach(name)
+    _worker_factory = DeckFactory(_worker_template.catalogue, _worker_template.template)
+
+def worker_deck_factory() -> Optional[DeckFactory]:
+    return _worker_factory
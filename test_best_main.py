@@ -0,0 +1,53 @@
+import contextlib
+import io
+import json
+import os
+import random
+
+import pytest
+
+from best_main import Player, load_rules, create_decks, play_rounds
+from self_play import random_policy
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+@pytest.fixture(autouse=True)
+def repo_dir(monkeypatch):
+    # The engine reads the card JSON files relative to the working directory
+    monkeypatch.chdir(REPO_DIR)
+
+def write_rules(tmp_path, values: dict) -> str:
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(values))
+    return str(path)
+
+@pytest.mark.parametrize("values", [
+    {"hand_sizes": 5},                          # Unknown rule
+    {"hand_size": "5"},                         # String for an int
+    {"win_score": 50.5},                        # Float for an int
+    {"win_score": True},                        # Bool for an int
+    {"chainsaw_stops_effects": 1},              # Int for a bool
+    {"max_players": 12},                        # More seats than the table has
+    {"min_players": 1},
+    {"disaster_limit": 0},
+    {"max_players": 8, "hand_size": 9},         # Deck too small to deal every hand
+])
+def test_load_rules_rejects_invalid(tmp_path, values):
+    with pytest.raises(ValueError):
+        load_rules(write_rules(tmp_path, values))
+
+def test_load_rules_accepts_variant():
+    rules = load_rules("rules_large_table.json")
+    assert rules.max_players == 8
+    assert rules.disaster_deck_size == 40
+
+def test_largest_variant_never_runs_out_of_cards(tmp_path):
+    # The largest table and hand load_rules accepts, played by bots until someone wins or disasters run out
+    rules = load_rules(write_rules(tmp_path, {"max_players": 8, "hand_size": 7, "disaster_deck_size": 40}))
+    random.seed(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(300):
+            player_list = [Player(f"Bot {i+1}") for i in range(rules.max_players)]
+            for player in player_list:
+                player.policy = random_policy
+            play_rounds(player_list, create_decks(rules), rules, lambda *args: None, interactive=False)
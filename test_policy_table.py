@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pytest
+
+from best_main import Player, PlayerCard, DisasterCard, DISASTER_TYPES
+from self_play import (NUM_FEATURES, SEAT, HAND, OWN_SCORE, OPPONENT_SCORES, OWN_DISASTERS, DISASTER_TYPE,
+                       TIEBREAK, DECISION_SLOT, DECISION_CARD, OUTCOME)
+from policy_table import UNSEEN, compile_table, state_index, TablePolicy
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Card ids are JSON order: Tiny Stick (1 point), Spear (4), Cannon (7), Disaster Insurance (instant)
+TINY_STICK, SPEAR, CANNON, INSURANCE = 10, 13, 16, 19
+
+@pytest.fixture(autouse=True)
+def repo_dir(monkeypatch):
+    monkeypatch.chdir(REPO_DIR)
+
+def decision(slot: int, card_id: int, won: bool) -> np.ndarray:
+    row = np.full(NUM_FEATURES, -1, dtype=np.int16)
+    row[SEAT] = 0
+    row[HAND:HAND + 4] = [INSURANCE, TINY_STICK, SPEAR, CANNON]
+    row[OWN_SCORE] = 10
+    row[OPPONENT_SCORES] = 12
+    row[OWN_DISASTERS] = 1
+    row[DISASTER_TYPE] = DISASTER_TYPES.index("Predator")
+    row[TIEBREAK] = 0
+    row[DECISION_SLOT] = slot
+    row[DECISION_CARD] = card_id
+    row[OUTCOME] = won
+    return row
+
+def features() -> np.ndarray:
+    # Playing the Cannon (highest of three point cards) always won, the Tiny Stick never did
+    return np.stack([decision(3, CANNON, True)] * 3 + [decision(1, TINY_STICK, False)] * 3)
+
+def test_compile_table_picks_best_rank():
+    table = compile_table(features(), min_samples=3, chunk_rows=4)
+    state = state_index(3, 7, -2, 1, DISASTER_TYPES.index("Predator"), 0)
+
+    assert table[state] == 2
+    assert np.sum(table != UNSEEN) == 1
+
+def test_compile_table_needs_min_samples():
+    assert np.all(compile_table(features(), min_samples=4) == UNSEEN)
+
+def hand_player(score: int) -> Player:
+    player = Player("Bot 1")
+    player.score = score
+    player.disasters = [DisasterCard("Natural")]
+    player.cards = [PlayerCard(card_type="instant", points=None, effect="Avoid Disaster", title="Disaster Insurance"),
+                    PlayerCard(card_type="point", points=7, effect="None", title="Cannon"),
+                    PlayerCard(card_type="point", points=1, effect="None", title="Tiny Stick"),
+                    PlayerCard(card_type="point", points=4, effect="None", title="Spear")]
+    return player
+
+def opponent(score: int) -> Player:
+    player = Player("Bot 2")
+    player.score = score
+    return player
+
+def test_table_policy_looks_up_point_card():
+    policy = TablePolicy(compile_table(features(), min_samples=3))
+    player = hand_player(10)
+
+    choice = policy(player, [player, opponent(12)], DisasterCard("Predator"), False)
+    assert player.cards[choice].type == "point"
+    assert player.cards[choice].title == "Cannon"
+
+def test_table_policy_falls_back_for_unseen_state():
+    policy = TablePolicy(compile_table(features(), min_samples=3))
+    player = hand_player(40)
+
+    # Score gap +28 was never seen, the nearest seen gap answers
+    choice = policy(player, [player, opponent(12)], DisasterCard("Predator"), False)
+    assert player.cards[choice].title == "Cannon"
+    assert policy.fallback.cache_info().misses == 1
+
+    # Nothing is seen for a tiebreak, the most common rank is used
+    choice = policy(player, [player, opponent(12)], DisasterCard("Predator"), True)
+    assert player.cards[choice].type == "point"
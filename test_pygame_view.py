@@ -0,0 +1,62 @@
+import os
+import random
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+import pygame
+import pytest
+
+from best_main import Player, PlayerCard
+import pygame_view
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+@pytest.fixture
+def display(monkeypatch):
+    # The engine reads the card JSON files relative to the working directory
+    monkeypatch.chdir(REPO_DIR)
+    pygame.init()
+    yield
+    pygame.quit()
+
+def test_bot_game_finishes(display):
+    random.seed(0)
+    winner = pygame_view.play(4, [], delay=0)
+    assert isinstance(winner, Player)
+
+def test_click_chooses_point_card(display):
+    human = Player("Player 1")
+    human.cards = [PlayerCard(card_type="instant", points=None, effect="Avoid Disaster", title="Disaster Insurance"),
+                   PlayerCard(card_type="point", points=7, effect="None", title="Cannon")]
+    view = pygame_view.GameView([human, Player("Bot 2")], delay=0)
+    view.draw()
+
+    # A click on the instant card is ignored, the one on the point card is taken
+    for rect in view.hand_rects[0]:
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=rect.center))
+    assert view.choose_point_card(human, view.player_list, None, False) == 1
+    assert view.active is None
+
+@pytest.mark.parametrize("num_players", [2, 3, 8])
+def test_full_hand_fits_on_screen(display, num_players):
+    player_list = [Player(f"Player {i+1}") for i in range(num_players)]
+    for player in player_list:
+        player.cards = [PlayerCard(card_type="point", points=i, effect="None", title="Tiny Stick") for i in range(5)]
+        player.played_card = PlayerCard(card_type="point", points=9, effect="None", title="Bigger Bazooka")
+    view = pygame_view.GameView(player_list, delay=0)
+    view.draw()
+
+    screen = view.screen.get_rect()
+    for seat in range(num_players):
+        assert len(view.hand_rects[seat]) == 5
+        for rect in view.hand_rects[seat] + [view.card_rect(seat, 0)]:
+            assert screen.contains(rect)
+
+def test_expose_redraws_every_region(display):
+    view = pygame_view.GameView([Player("Player 1"), Player("Bot 2")], delay=0)
+    view.draw()
+    view.drawn[("header",)] = None
+
+    pygame.event.post(pygame.event.Event(pygame.WINDOWEXPOSED))
+    view.wait(50)
+    assert view.drawn[("header",)] == (0, "", "")